@@ -3,12 +3,14 @@
 import asyncio
 import datetime
 import logging
+import struct
 import sys
 import time
 
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
+import orjson
 
 from fastapi import Depends, FastAPI, HTTPException, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
@@ -36,31 +38,44 @@ app.add_middleware(
 app_log = logging.getLogger('modbus.d3.app')
 app_log.setLevel(logging.INFO)
 sh = logging.StreamHandler()
+sh.setLevel(logging.WARNING)
 fmt = '%(asctime)s,%(levelname)s,%(message)s'
 datefmt = '%H:%M:%S'
-sh.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
+formatter = logging.Formatter(fmt=fmt, datefmt=datefmt)
+sh.setFormatter(formatter)
 app_log.addHandler(sh)
 
+#: File handler attached by :func:`get_file_logger`, if any
+_file_handler: Optional[logging.FileHandler] = None
+
+#: Shared Modbus client, built lazily by :func:`get_client`
+_client: Optional[AsyncModbusTCPClient] = None
+#: Guards building the shared client; created by :func:`startup`
+_client_lock: Optional[asyncio.Lock] = None
+#: Serializes Modbus transactions on the shared client; created by
+#: :func:`startup`
+_read_lock: Optional[asyncio.Lock] = None
+#: Background task keeping the shared client connected
+_keepalive_task: Optional[asyncio.Task] = None
+
 
 # Helper
-def convert_bits(timeb: list[bool], sinb: list[bool]) -> Tuple[float, float]:
-    """Converts `timeb` bits and `sinb` bits to time and float.
+def convert_bits(bits: np.ndarray) -> Tuple[float, float]:
+    """Converts coil `bits` to time and float.
 
     Args:
-        timeb: 64 bits representing current server time.
-        sinb: 32 bits representing current server sin(t).
+        bits: 96 bits as a uint8 array; the first 64 represent current server
+            time and the last 32 represent current server sin(t).
 
     Returns:
         Tuple of `(epoch_time, sin(epoch_time))`.`
     """
 
-    # Convert time bits
-    bstring = ''.join(['1' if bit else '0' for bit in timeb])
-    tyme = np.asarray(int(bstring, 2), dtype=np.uint64).view(np.float64).item()
+    # Pack all 96 bits into 12 big-endian bytes
+    packed = np.packbits(bits)
 
-    # Convert sin(t) bits
-    bstring = ''.join(['1' if bit else '0' for bit in sinb])
-    sin = np.asarray(int(bstring, 2), dtype=np.uint32).view(np.float32).item()
+    # Convert time bits and sin(t) bits
+    tyme, sin = struct.unpack_from('>df', packed)
 
     return tyme, sin
 
@@ -76,15 +91,12 @@ async def read_coils(client: AsyncModbusTCPClient) -> Tuple[float, float]:
         Tuple of `(epoch_time, sin(epoch_time))`.`
     """
 
-    # Read coils for time bits
-    rrt = await client.protocol.read_coils(0, 64)
-    time_bits = rrt.bits
-
-    # Read coils for sin(t) bits
-    rrs = await client.protocol.read_coils(64, 32)
-    sin_bits = rrs.bits
+    # Read coils for time bits and sin(t) bits in a single request
+    async with _read_lock:
+        rr = await client.protocol.read_coils(0, 96)
+    bits = np.fromiter(rr.bits, dtype=np.uint8, count=96)
 
-    epoch_time, sin = convert_bits(time_bits, sin_bits)
+    epoch_time, sin = convert_bits(bits)
     return epoch_time, sin
 
 
@@ -96,14 +108,16 @@ def get_file_logger() -> logging.Logger:
         The app logger object.
     """
 
-    if len(app_log.handlers) > 1:
+    global _file_handler
+    if _file_handler is not None:
         return app_log
 
     now = datetime.datetime.now()
     filename = now.strftime('%Y.%m.%d.%H.%M.%S') + '.log'
-    fh = logging.FileHandler(filename)
-    fh.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
-    app_log.addHandler(fh)
+    _file_handler = logging.FileHandler(filename)
+    _file_handler.setLevel(logging.INFO)
+    _file_handler.setFormatter(formatter)
+    app_log.addHandler(_file_handler)
     return app_log
 
 
@@ -114,19 +128,16 @@ def drop_file_logger() -> logging.Logger:
         The app logger object.
     """
 
-    if len(app_log.handlers) == 1:
-        return
-
-    shs = [
-        h for h in app_log.handlers
-        if not isinstance(h, logging.FileHandler)]
-    app_log.handlers = shs
+    global _file_handler
+    if _file_handler is not None:
+        app_log.removeHandler(_file_handler)
+        _file_handler.close()
+        _file_handler = None
     return app_log
 
 
-# Dependency
-async def get_client() -> AsyncModbusTCPClient:
-    """Gets an AsyncModbusTCPClient.
+async def build_client() -> AsyncModbusTCPClient:
+    """Builds a new, connected AsyncModbusTCPClient.
 
     Returns:
         The client object.
@@ -143,6 +154,41 @@ async def get_client() -> AsyncModbusTCPClient:
     return client
 
 
+# Dependency
+async def get_client() -> AsyncModbusTCPClient:
+    """Gets the shared AsyncModbusTCPClient, building it if needed.
+
+    Returns:
+        The client object.
+    """
+
+    global _client
+    async with _client_lock:
+        if _client is None or _client.protocol is None:
+            if _client is not None:
+                # Stop the stale client's own reconnect loop before replacing
+                _client.stop()
+            _client = await build_client()
+    return _client
+
+
+def drop_client(client: Optional[AsyncModbusTCPClient]):
+    """Stops and drops `client` if it is still the shared client.
+
+    The next :func:`get_client` then rebuilds the shared client. A `client`
+    that has already been replaced is left alone so a healthy replacement is
+    not discarded.
+
+    Args:
+        client: Client that failed.
+    """
+
+    global _client
+    if client is not None and client is _client:
+        _client.stop()
+        _client = None
+
+
 @app.get("/")
 async def get(
     client=Depends(get_client),
@@ -185,14 +231,15 @@ async def get_data(
             "'NoneType' object has no attribute 'read_coils'",
         ]
         log.warning('AttributeError, rebuilding client and retrying...')
+        drop_client(client)
         raise HTTPException(
-            status_code=500,
+            status_code=503,
             detail='AsyncModbusTCPClient AttributeError exception raised',
         )
     except asyncio.TimeoutError:
         log.warning('TimeoutError, retrying...')
         raise HTTPException(
-            status_code=500,
+            status_code=503,
             detail='asyncio.TimeoutError exception raised',
         )
     return {'x': epoch_time, 'y': epoch_sin}
@@ -211,23 +258,61 @@ def reset_log(log=Depends(drop_file_logger)):
 
     return {}
 
+
+async def keepalive(interval: float = 5):
+    """Keeps the shared Modbus client connected.
+
+    Args:
+        interval: Interval in seconds between keepalive reads.
+    """
+
+    while True:
+        client = None
+        try:
+            client = await get_client()
+            async with _read_lock:
+                await client.protocol.read_coils(0, 1)
+        except Exception as exc:
+            app_log.warning('Keepalive failed (%r), dropping client...', exc)
+            drop_client(client)
+        await asyncio.sleep(interval)
+
+
+@app.on_event('startup')
+async def startup():
+    """Creates the app locks and starts the client keepalive task."""
+
+    global _client_lock, _read_lock, _keepalive_task
+    _client_lock = asyncio.Lock()
+    _read_lock = asyncio.Lock()
+    _keepalive_task = asyncio.create_task(keepalive())
+
+
+@app.on_event('shutdown')
+async def shutdown():
+    """Stops the client keepalive task and the shared client."""
+
+    if _keepalive_task is not None:
+        _keepalive_task.cancel()
+    drop_client(_client)
+
+
 @app.websocket('/ws')
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    client = await get_client()
     log = get_file_logger()
     while True:
-        data = await websocket.receive_json()
+        data = orjson.loads(await websocket.receive_text())
         if data['method'] == 'get':
             try:
-                resp = await get_data(client, log)
+                resp = await get_data(await get_client(), log)
             except HTTPException:
                 resp = {'x': time.time(), 'y': 0, 'e': 1}
-            await websocket.send_json(resp)
+            await websocket.send_text(orjson.dumps(resp).decode())
         elif data['method'] == 'reset':
             drop_file_logger()
             log = get_file_logger()
-            await websocket.send_json({})
+            await websocket.send_text('{}')
         elif data['method'] == 'close':
             break
     await websocket.close()
@@ -3,9 +3,10 @@
 import asyncio
 import datetime
 import logging
+import struct
 import sys
 
-from typing import List, Tuple
+from typing import Tuple
 
 import numpy as np
 
@@ -13,6 +14,11 @@ from pymodbus.client.asynchronous.async_io import ModbusClientProtocol
 from pymodbus.client.asynchronous.tcp import AsyncModbusTCPClient
 from pymodbus.client.asynchronous import schedulers
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 
 # Set up basic logging
 logging.basicConfig()
@@ -20,24 +26,22 @@ log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG)
 
 
-def convert_bits(timeb: List[bool], sinb: List[bool]) -> Tuple[float, float]:
-    """Converts `timeb` bits and `sinb` bits to time and float.
+def convert_bits(bits: np.ndarray) -> Tuple[float, float]:
+    """Converts coil `bits` to time and float.
 
     Args:
-        timeb: 64 bits representing current server time.
-        sinb: 32 bits representing current server sin(t).
+        bits: 96 bits as a uint8 array; the first 64 represent current server
+            time and the last 32 represent current server sin(t).
 
     Returns:
         Tuple of `(epoch_time, sin(epoch_time))`.`
     """
 
-    # Convert time bits
-    bstring = ''.join(['1' if bit else '0' for bit in timeb])
-    tyme = np.asarray(int(bstring, 2), dtype=np.uint64).view(np.float64).item()
+    # Pack all 96 bits into 12 big-endian bytes
+    packed = np.packbits(bits)
 
-    # Convert sin(t) bits
-    bstring = ''.join(['1' if bit else '0' for bit in sinb])
-    sin = np.asarray(int(bstring, 2), dtype=np.uint32).view(np.float32).item()
+    # Convert time bits and sin(t) bits
+    tyme, sin = struct.unpack_from('>df', packed)
 
     return tyme, sin
 
@@ -54,19 +58,18 @@ async def read_coils(
         Tuple of `(epoch_time, sin(epoch_time))`.`
     """
 
+    attempt = 0
     while True:
         try:
-            # Read coils for time bits
-            rrt = await protocol.read_coils(0, 64)
-            time_bits = rrt.bits
-
-            # Read coils for sin(t) bits
-            rrs = await protocol.read_coils(64, 32)
-            sin_bits = rrs.bits
-
-            epoch_time, sin = convert_bits(time_bits, sin_bits)
-            dtime = datetime.datetime.fromtimestamp(epoch_time)
-            log.debug('time: %s\tsin(t): %.6f', dtime, sin)
+            # Read coils for time bits and sin(t) bits in a single request
+            rr = await protocol.read_coils(0, 96)
+            bits = np.fromiter(rr.bits, dtype=np.uint8, count=96)
+
+            epoch_time, sin = convert_bits(bits)
+            if log.isEnabledFor(logging.DEBUG):
+                dtime = datetime.datetime.fromtimestamp(epoch_time)
+                log.debug('time: %s\tsin(t): %.6f', dtime, sin)
+            attempt = 0
             await asyncio.sleep(1)
         except AttributeError as exc:
             assert exc.args[0] in [
@@ -74,16 +77,33 @@ async def read_coils(
                 "'NoneType' object has no attribute 'read_coils'",
             ]
             log.debug('AttributeError, rebuilding client and retrying...')
+            await backoff(attempt)
+            attempt += 1
             client = await get_client()
             protocol = client.protocol
-            await asyncio.sleep(1)
         except asyncio.TimeoutError:
             log.debug('TimeoutError, retrying...')
-            await asyncio.sleep(1)
+            await backoff(attempt)
+            attempt += 1
         except asyncio.CancelledError:
             break
 
 
+async def backoff(attempt: int, base: float = 0.05, cap: float = 2.0):
+    """Waits before retry number `attempt` of a failed read.
+
+    The first retry is immediate; later retries wait exponentially longer.
+
+    Args:
+        attempt: Number of consecutive failed attempts so far.
+        base: Delay in seconds before the second retry.
+        cap: Maximum delay in seconds.
+    """
+
+    if attempt:
+        await asyncio.sleep(min(base * 2 ** (attempt - 1), cap))
+
+
 async def get_client() -> AsyncModbusTCPClient:
     """Gets an AsyncModbusTCPClient.
 
@@ -117,6 +137,8 @@ if __name__ == '__main__':
             asyncio.set_event_loop_policy(
                 asyncio.WindowsSelectorEventLoopPolicy(),
             )
+        elif uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
         asyncio.run(main())
     except KeyboardInterrupt:
         log.debug('Closing Modbus client and Bokeh server')
@@ -2,7 +2,9 @@
 
 import asyncio
 import logging
+import math
 import signal
+import struct
 import sys
 import time
 
@@ -13,11 +15,29 @@ from pymodbus.device import ModbusDeviceIdentification
 from pymodbus.server.async_io import ModbusTcpServer
 from pymodbus.version import version
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Set up basic logging
 logging.basicConfig()
 logging.getLogger().setLevel(logging.DEBUG)
 log = logging.getLogger(__name__)
 
+# Scratch buffer for the coil values as 12 big-endian bytes (64-bit time,
+# 32-bit sin(t))
+_bytes_buf = np.empty(12, dtype=np.uint8)
+
+# Server information
+identity = ModbusDeviceIdentification()
+identity.VendorName = 'Pymodbus'
+identity.ProductCode = 'PM'
+identity.VendorUrl = 'http://github.com/riptideio/pymodbus/'
+identity.ProductName = 'Pymodbus Server'
+identity.ModelName = 'Pymodbus Server'
+identity.MajorMinorRevision = version.short()
+
 
 def update_coils(context: ModbusSlaveContext):
     """Updates the coils of slave `context` with new values.
@@ -26,23 +46,14 @@ def update_coils(context: ModbusSlaveContext):
         context: Slave context to update.
     """
 
-    # Get epoch time as 64 bits
+    # Get epoch time as 64 bits and sin(t) as 32 bits
     now = time.time()
-    bstring = f'{np.asarray(now, dtype=np.float64).view(np.uint64):064b}'
-    bits = [b == '1' for b in bstring]
+    struct.pack_into('>df', _bytes_buf, 0, now, math.sin(now))
+    bits = np.unpackbits(_bytes_buf)
 
     # Update coils from hex address 0 (fx 1 maps to coils)
     fx = 1
-    context.setValues(fx, 0, bits)
-
-    # Get sin(t) as 32 bits
-    sin = np.sin(now)
-    bstring = f'{np.asarray(sin, dtype=np.float32).view(np.uint32):032b}'
-    bits = [b == '1' for b in bstring]
-
-    # Update coils from address 2 (fx 1 maps to coils)
-    fx = 1
-    context.setValues(fx, 64, bits)
+    context.setValues(fx, 0, bits.tolist())
 
 
 async def update_context(context: ModbusServerContext, interval: float = 0.1):
@@ -53,13 +64,22 @@ async def update_context(context: ModbusServerContext, interval: float = 0.1):
         interval: Interval in seconds between updates.
     """
 
-    # Update slave context on set interval
+    # Update slave context on set interval, sleeping until the next deadline
+    # so the cost of each update does not accumulate as drift
     unit = 0x00
     slave = context[unit]
+    loop = asyncio.get_running_loop()
+    next_t = loop.time()
     while True:
         try:
+            next_t += interval
             update_coils(slave)
-            await asyncio.sleep(interval)
+            delay = next_t - loop.time()
+            if delay < -2 * interval:
+                # Fell too far behind (e.g. process stalled), so resync
+                next_t = loop.time() + interval
+                delay = interval
+            await asyncio.sleep(max(0, delay))
         except asyncio.CancelledError:
             log.debug('Cancelling context updates')
             break
@@ -76,22 +96,19 @@ async def main():
     store = ModbusSlaveContext()
     context = ModbusServerContext(slaves=store)
 
-    # Initialize server information
-    identity = ModbusDeviceIdentification()
-    identity.VendorName = 'Pymodbus'
-    identity.ProductCode = 'PM'
-    identity.VendorUrl = 'http://github.com/riptideio/pymodbus/'
-    identity.ProductName = 'Pymodbus Server'
-    identity.ModelName = 'Pymodbus Server'
-    identity.MajorMinorRevision = version.short()
-
     # Add coils updater to event loop
     loop = asyncio.get_event_loop()
     task = loop.create_task(update_context(context))
 
     # Create the TCP Server
     adr = ('', 5020)
-    server = ModbusTcpServer(context, address=adr, defer_start=True, loop=loop)
+    server = ModbusTcpServer(
+        context,
+        identity=identity,
+        address=adr,
+        defer_start=True,
+        loop=loop,
+    )
 
     # Add signal handlers for graceful closure
     for sig in (signal.SIGINT, signal.SIGTERM):
@@ -117,4 +134,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    if uvloop is not None and not sys.platform.startswith('win'):
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())